@@ -1,7 +1,17 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import io
+import csv
+import os
+import time
+import hashlib
 import urllib.parse
+import threading
+import concurrent.futures
+import requests
 import streamlit.components.v1 as components
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # ============================================================
 # PAGE CONFIGURATION
@@ -28,31 +38,467 @@ EXPENSE_CSV_URL = f"https://docs.google.com/spreadsheets/d/{EXPENSE_SHEET_ID}/gv
 COW_LOG_CSV_URL = f"https://docs.google.com/spreadsheets/d/{COW_LOG_SHEET_ID}/gviz/tq?tqx=out:csv&sheet=dailylog"
 PAYMENT_CSV_URL = f"https://docs.google.com/spreadsheets/d/{PAYMENT_SHEET_ID}/gviz/tq?tqx=out:csv&sheet=payment"
 
+SHEET_URLS = {
+    "investment": INVESTMENT_CSV_URL,
+    "milk_m": MILK_DIS_M_CSV_URL,
+    "milk_e": MILK_DIS_E_CSV_URL,
+    "expense": EXPENSE_CSV_URL,
+    "cow_log": COW_LOG_CSV_URL,
+    "payment": PAYMENT_CSV_URL,
+}
+ALL_SHEETS = tuple(SHEET_URLS)
+
+# Sheets each page reads, so a visit only downloads what that page shows
+PAGE_SHEETS = {
+    "🏠 Dashboard": ("cow_log", "milk_m", "milk_e"),  # ledgers only feed the cached KPIs
+    "Milking & Feeding": ("cow_log", "milk_m", "milk_e"),
+    "Milk Distribution": ("cow_log", "milk_m", "milk_e"),
+    "Expense": ("expense",),
+    "Payments": ("payment",),
+    "Investments": ("investment",),
+}
+
+# ============================================================
+# REPORTING WINDOW
+# ============================================================
+START_DATE = pd.Timestamp("2025-11-01")
+# First day the dashboard checks for missing form entries
+VALIDATION_START = START_DATE
+# Production sheets only count records from START_DATE onward
+SHEETS_FROM_START = ("cow_log", "milk_m", "milk_e")
+# Distribution sheets: every column except Date is litres per customer
+DISTRIBUTION_SHEETS = ("milk_m", "milk_e")
+# Ledger column naming who paid / received / spent (for the Bipin Kumar fund)
+PERSON_COLUMNS = {"investment": "Paid To", "payment": "Received By", "expense": "Expense By"}
+FUND_PERSON = "bipin kumar"  # normalized (stripped, lower-case) name
+# Canonical name the cow log's milk column is renamed to at load
+MILK_COLUMN = "Milking -दूध"
+# Ledger money columns cast to float64 once at load (float32 loses paise above ~₹1.3 lakh);
+# milk litres (distribution sheets: all but Date; cow log: milk column) are float32
+NUMERIC_COLUMNS = {"investment": ("Amount",), "payment": ("Amount",), "expense": ("Amount",)}
+# Low-cardinality text columns stored as category (cheaper groupby / memory)
+CATEGORY_COLUMNS = {
+    "cow_log": ("CowID",),
+    "expense": ("Expense Type", "Expense By"),
+    "investment": ("Paid To",),
+    "payment": ("Received By",),
+}
+
+# ============================================================
+# LOCAL SHEET CACHE (survives server restarts)
+# ============================================================
+CACHE_TTL = 600
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "dairyfarm")
+
+HTTP_TIMEOUT = 10
+
 # ============================================================
 # UTILITY FUNCTIONS
 # ============================================================
-@st.cache_data(ttl=600)
-def load_csv(url, drop_cols=None):
-    """Load a CSV from Google Sheets"""
+@st.cache_resource(show_spinner=False)
+def http_session():
+    """One keep-alive session per process, so sheet downloads reuse the docs.google.com connection across reruns"""
+    return requests.Session()
+
+
+def cache_path(url):
+    """Parquet file used to persist the sheet behind a URL"""
+    return os.path.join(CACHE_DIR, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".parquet")
+
+
+def clear_disk_cache():
+    """Delete the persisted parquet copies so the next load goes to Google Sheets"""
+    for url in SHEET_URLS.values():
+        for path in (cache_path(url), cache_path(url) + ".etag"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def parse_dates(df):
+    """Convert the Date column to datetime (no-op if it already is)"""
+    # pandas >= 2 infers the format from the first value and parses the rest with it
+    if "Date" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["Date"]):
+        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    return df
+
+
+def read_sheet_csv(content, drop_cols=()):
+    """Parse downloaded CSV bytes with the pyarrow engine, falling back to the C parser"""
+    try:
+        # pyarrow's usecols must be a list of names, so take them from the header row
+        header = next(csv.reader([content.split(b"\n", 1)[0].decode("utf-8-sig")]))
+        usecols = [c for c in header if c not in drop_cols]
+        return pd.read_csv(io.BytesIO(content), engine="pyarrow", usecols=usecols)
+    except Exception:
+        pass  # pyarrow missing, or a header it cannot handle (duplicate / blank names)
+    return pd.read_csv(io.BytesIO(content), usecols=lambda c: c not in drop_cols)
+
+
+def fetch_csv(url, drop_cols=("Timestamp",)):
+    """Read a sheet CSV (minus drop_cols), reusing the on-disk parquet copy while it is fresh"""
+    path = cache_path(url)
+    etag_path = path + ".etag"
+    headers = {}
+    try:
+        if time.time() - os.path.getmtime(path) < CACHE_TTL:
+            return pd.read_parquet(path, engine="pyarrow")
+        # Stale copy: revalidate it instead of downloading the sheet again
+        with open(etag_path, encoding="utf-8") as f:
+            kind, _, value = f.read().partition(" ")
+        headers = {"If-None-Match": value} if kind == "etag" else {"If-Modified-Since": value}
+    except Exception:
+        pass  # missing / unreadable cache → go to the network
+
+    resp = http_session().get(url, timeout=HTTP_TIMEOUT, headers=headers)
+    if resp.status_code == 304:
+        try:
+            os.utime(path)  # unchanged upstream → the parquet copy is fresh again
+            return pd.read_parquet(path, engine="pyarrow")
+        except Exception:
+            resp = http_session().get(url, timeout=HTTP_TIMEOUT)
+    resp.raise_for_status()
+    # usecols lets the parser skip unwanted columns instead of building and dropping them
+    df = read_sheet_csv(resp.content, tuple(drop_cols or ()))
+    # Parse Date before caching so parquet stores datetime64 and cache hits skip the parse
+    df = parse_dates(df)
     try:
-        df = pd.read_csv(url)
-        if drop_cols:
-            df = df.drop(columns=[col for col in drop_cols if col in df.columns])
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        df.to_parquet(path, engine="pyarrow", compression="zstd")
+        etag, modified = resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+        if etag or modified:
+            with open(etag_path, "w", encoding="utf-8") as f:
+                f.write(f"etag {etag}" if etag else f"modified {modified}")
+        elif os.path.exists(etag_path):
+            os.remove(etag_path)
+    except Exception:
+        # Caching is best effort (e.g. mixed-type columns), but the old validator must not
+        # keep vouching for the old parquet copy, or a later 304 would serve stale data
+        try:
+            os.remove(etag_path)
+        except OSError:
+            pass
+    return df
+
+
+def filter_from_start_date(df):
+    """Parse Date and keep only rows dated on or after START_DATE"""
+    if df.empty or "Date" not in df.columns:
         return df
-    except Exception as e:
-        st.error(f"❌ Failed to load data from Google Sheet: {e}")
-        return pd.DataFrame()
+    dates = pd.to_datetime(df["Date"], errors="coerce")  # cheap when already datetime64
+    mask = dates.to_numpy() >= START_DATE.to_datetime64()  # NaT compares False
+    return df.loc[mask].assign(Date=dates[mask])
+
+
+def detect_milk_column(df):
+    """Find the milk quantity column"""
+    return next((c for c in df.columns if "milk" in c.lower() or "दूध" in c), None)
+
+
+def coerce_numeric(df, numeric_cols, dtype="float32"):
+    """Cast the given columns to dtype once (bad values → NaN)"""
+    cols = [c for c in numeric_cols if c in df.columns]
+    # Columns the CSV parser already typed as numbers only need the cast
+    typed = [c for c in cols if pd.api.types.is_numeric_dtype(df[c])]
+    untyped = [c for c in cols if c not in typed]
+    if typed:
+        df[typed] = df[typed].astype(dtype)
+    if untyped:
+        # One to_numeric call over the flattened text block instead of one per column
+        values = pd.to_numeric(df[untyped].to_numpy(dtype=object).ravel(), errors="coerce")
+        df[untyped] = values.astype(dtype).reshape(len(df), len(untyped))
+    return df
+
+
+def to_category(df, category_cols):
+    """Store the given text columns as pandas category"""
+    cols = [c for c in category_cols if c in df.columns]
+    if cols:
+        df[cols] = df[cols].astype("category")
+    return df
+
+
+# Date stays datetime64 in the displayed frames; the table formats it client-side
+DISPLAY_COLUMN_CONFIG = {"Date": st.column_config.DateColumn("Date", format="DD-MM-YYYY")}
+
+
+def for_display(df):
+    """Hide helper columns (prefixed "_"); pair with column_config=DISPLAY_COLUMN_CONFIG"""
+    df = df.drop(columns=[c for c in df.columns if str(c).startswith("_")])
+    # float32 values like 2.3 would render as 2.2999999; show them as 2-decimal float64
+    float32_cols = df.select_dtypes("float32").columns
+    if len(float32_cols):
+        df = df.assign(**{c: df[c].astype("float64").round(2) for c in float32_cols})
+    return df
+
+
+def latest_first(df):
+    """Rows newest Date first; sheets are appended in date order, so usually a reversed view"""
+    if df["Date"].is_monotonic_increasing:
+        return df.iloc[::-1]
+    return df.sort_values("Date", ascending=False, kind="mergesort")
+
+
+@st.cache_resource(ttl=CACHE_TTL, max_entries=len(SHEET_URLS), show_spinner=False)
+def get_sheet(key):
+    """One sheet (a SHEET_URLS key), cleaned once and shared by every page and session.
+
+    Timestamp is dropped and Date parsed; production sheets are trimmed to START_DATE.
+    The frame is shared between reruns and sessions (no copy on read): callers must
+    .copy() before mutating it.
+    """
+    df = fetch_csv(SHEET_URLS[key], drop_cols=("Timestamp",))
+    # Stray spaces in form headers would break the literal column names used by the pages
+    df = df.rename(columns=lambda c: str(c).strip())
+    if key in SHEETS_FROM_START:
+        df = filter_from_start_date(df)
+    else:
+        df = parse_dates(df)
+    if key in DISTRIBUTION_SHEETS:
+        df = coerce_numeric(df, [c for c in df.columns if c != "Date"])
+    elif key == "cow_log":
+        milk_col = detect_milk_column(df)
+        if milk_col and milk_col != MILK_COLUMN:
+            df = df.rename(columns={milk_col: MILK_COLUMN})
+        df = coerce_numeric(df, [MILK_COLUMN])
+    else:
+        df = coerce_numeric(df, NUMERIC_COLUMNS.get(key, ()), dtype="float64")
+    df = to_category(df, CATEGORY_COLUMNS.get(key, ()))
+    person_col = PERSON_COLUMNS.get(key)
+    if person_col in df.columns:
+        df["_person"] = df[person_col].astype(str).str.strip().str.lower().astype("category")
+    if "Date" in df.columns:
+        # Sorted once here, so latest_first() on the pages is a reversed view, not a sort
+        if not df["Date"].is_monotonic_increasing:
+            df = df.sort_values("Date", kind="stable")
+        df["_month"] = df["Date"].dt.to_period("M")  # reused by every monthly figure / filter
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def sheet_pool():
+    """Process-wide worker pool for sheet loads (page loads and the background prefetch)"""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=len(SHEET_URLS))
+
+
+def load_sheet_in_worker(ctx, key):
+    """get_sheet(key) on a sheet_pool() thread, with the calling script's context attached only for the call"""
+    thread = threading.current_thread()
+    add_script_run_ctx(thread, ctx)  # let the worker use the Streamlit cache
+    try:
+        return get_sheet(key)
+    finally:
+        add_script_run_ctx(thread, None)  # pool threads outlive the session: don't keep its context
 
 
-def sum_numeric_columns(df, exclude_cols=None):
-    """Sum all numeric columns except excluded ones"""
-    if df.empty:
-        return 0
-    if exclude_cols is None:
-        exclude_cols = []
-    numeric_cols = [col for col in df.columns if col not in exclude_cols]
-    df_numeric = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-    return df_numeric.sum().sum()
+def load_all_filtered(keys, raise_errors=False):
+    """{key: get_sheet(key)} for a tuple of SHEET_URLS keys (see PAGE_SHEETS), cache misses fetched in parallel.
+
+    A failed sheet is reported with st.error and comes back empty; with raise_errors=True
+    the error is raised instead (for the st.cache_data callers, so it is not cached).
+    """
+    ctx = get_script_run_ctx()
+    futures = {key: sheet_pool().submit(load_sheet_in_worker, ctx, key) for key in keys}
+
+    bundle = {}
+    for key in keys:
+        try:
+            bundle[key] = futures[key].result()
+        except Exception as e:
+            if raise_errors:
+                raise
+            st.error(f"❌ Failed to load data from Google Sheet: {e}")
+            bundle[key] = pd.DataFrame()
+    return bundle
+
+
+def prefetch_sheets(keys):
+    """Start get_sheet(key) in the background; a page asking for the same sheet waits on that load"""
+    ctx = get_script_run_ctx()
+
+    def load(key):
+        try:
+            load_sheet_in_worker(ctx, key)
+        except Exception:
+            pass  # the page's own load reports the error
+
+    for key in keys:
+        sheet_pool().submit(load, key)
+
+
+@st.cache_resource(ttl=CACHE_TTL, show_spinner=False)
+def prefetch_all_sheets():
+    """Warm every sheet once per CACHE_TTL for the whole process, not once per browser session"""
+    prefetch_sheets(ALL_SHEETS)
+    return True
+
+
+def month_periods(df):
+    """Calendar month of each row (precomputed "_month" when the frame came from get_sheet)"""
+    if "_month" in df.columns:
+        return df["_month"]
+    return df["Date"].dt.to_period("M")
+
+
+def monthly_sum(df, col):
+    """Sum one column per calendar month (Series indexed by Period)"""
+    if df.empty or col is None or col not in df.columns or "Date" not in df.columns:
+        return pd.Series(dtype="float64")
+    values = df[col].astype("float64")  # litres are float32 since load; accumulate in float64
+    return values.groupby(month_periods(df)).sum()
+
+
+def row_totals(df, exclude_cols=("Timestamp", "Date")):
+    """Per-row sum of the numeric columns as one numpy reduction (NaN counts as 0)"""
+    df_numeric = df.drop(columns=[c for c in exclude_cols if c in df.columns]).select_dtypes("number")
+    return np.nansum(df_numeric.to_numpy(dtype="float64"), axis=1)
+
+
+def monthly_row_sum(df, exclude_cols=("Timestamp", "Date")):
+    """Sum all numeric columns per calendar month (Series indexed by Period)"""
+    if df.empty or "Date" not in df.columns:
+        return pd.Series(dtype="float64")
+    totals = pd.Series(row_totals(df, exclude_cols), index=df.index)
+    return totals.groupby(month_periods(df)).sum()
+
+
+def daily_sum(dates, values):
+    """Per-day totals via np.bincount on day offsets (Series indexed by day, empty days 0)"""
+    days = dates.to_numpy().astype("datetime64[D]")
+    values = np.nan_to_num(np.asarray(values, dtype="float64"))
+    known = ~np.isnat(days)
+    days, values = days[known], values[known]
+    if not len(days):
+        return pd.Series(dtype="float64", index=pd.DatetimeIndex([], name="Date"))
+    first = days.min()
+    totals = np.bincount((days - first).astype("int64"), weights=values)
+    return pd.Series(totals, index=pd.date_range(first, periods=len(totals), freq="D", name="Date"))
+
+
+def sum_by_category(keys, values):
+    """Sum values per category of a categorical Series via np.bincount on its codes (observed categories only)"""
+    codes = keys.cat.codes.to_numpy()
+    known = codes >= 0  # -1 marks a missing key
+    codes = codes[known]
+    values = np.nan_to_num(np.asarray(values, dtype="float64")[known])
+    n_cats = len(keys.cat.categories)
+    totals = np.bincount(codes, weights=values, minlength=n_cats)
+    observed = np.bincount(codes, minlength=n_cats) > 0
+    return pd.Series(totals[observed], index=keys.cat.categories[observed])
+
+
+def daily_distribution_totals(*frames):
+    """Total milk distributed per Date across the given sheets (Series indexed by Date, sorted)"""
+    frames = [df for df in frames if not df.empty]
+    if not frames:
+        return pd.Series(dtype="float64", name="Total", index=pd.DatetimeIndex([], name="Date"))
+    dates = np.concatenate([df["Date"].to_numpy() for df in frames])
+    totals = np.concatenate([row_totals(df) for df in frames])
+    return pd.Series(totals, index=pd.DatetimeIndex(dates, name="Date"), name="Total").groupby(level=0).sum()
+
+
+def dashboard_kpis(bundle, month):
+    """All dashboard metrics for the given "YYYY-MM" month from a load_all_filtered(ALL_SHEETS) bundle"""
+    bundle = {key: filter_from_start_date(df) for key, df in bundle.items()}
+    this_period = pd.Period(month, freq="M")
+
+    # One groupby per sheet gives both lifetime (.sum()) and this month (.get(period))
+    produced_by_month = monthly_sum(bundle["cow_log"], MILK_COLUMN)
+    distributed_by_month = monthly_row_sum(bundle["milk_m"]).add(monthly_row_sum(bundle["milk_e"]), fill_value=0)
+    expense_by_month = monthly_sum(bundle["expense"], "Amount")
+    payment_by_month = monthly_sum(bundle["payment"], "Amount")
+    investment_by_month = monthly_sum(bundle["investment"], "Amount")
+
+    # One groupby per ledger on the "_person" names normalized in get_sheet()
+    def amount_by_person(df):
+        if "_person" not in df.columns:
+            return pd.Series(dtype="float64")
+        return df["Amount"].groupby(df["_person"], observed=True).sum()
+
+    kpis = {
+        "total_milk_produced": produced_by_month.sum(),
+        "total_milk_distributed": distributed_by_month.sum(),
+        "total_expense": expense_by_month.sum(),
+        "total_payment_received": payment_by_month.sum(),
+        "total_investment": investment_by_month.sum(),
+        "fund_bipin": (
+            amount_by_person(bundle["investment"]).get(FUND_PERSON, 0)
+            + amount_by_person(bundle["payment"]).get(FUND_PERSON, 0)
+            - amount_by_person(bundle["expense"]).get(FUND_PERSON, 0)
+        ),
+        "milk_month": produced_by_month.get(this_period, 0),
+        "milk_distributed_month": distributed_by_month.get(this_period, 0),
+        "expense_month": expense_by_month.get(this_period, 0),
+        "payment_month": payment_by_month.get(this_period, 0),
+    }
+    kpis["remaining_milk"] = kpis["total_milk_produced"] - kpis["total_milk_distributed"]
+    kpis["remaining_milk_month"] = kpis["milk_month"] - kpis["milk_distributed_month"]
+    return {k: float(v) for k, v in kpis.items()}
+
+
+@st.cache_data(ttl=60, max_entries=2, show_spinner=False)  # keyed by month: this one and at most the last
+def compute_dashboard_kpis(month):
+    """dashboard_kpis() reused across reruns; a failed sheet raises, so partial figures are never cached"""
+    return dashboard_kpis(load_all_filtered(ALL_SHEETS, raise_errors=True), month)
+
+
+def production_metrics(bundle, month):
+    """Milk produced / distributed totals for the Milking and Distribution pages, for a "YYYY-MM" month"""
+    this_period = pd.Period(month, freq="M")
+
+    produced_by_month = monthly_sum(bundle["cow_log"], MILK_COLUMN)
+    distributed_by_month = monthly_row_sum(bundle["milk_m"]).add(monthly_row_sum(bundle["milk_e"]), fill_value=0)
+
+    metrics = {
+        "total_milk_produced": produced_by_month.sum(),
+        "total_milk_distributed": distributed_by_month.sum(),
+        "milk_month": produced_by_month.get(this_period, 0),
+        "milk_distributed_month": distributed_by_month.get(this_period, 0),
+    }
+    metrics["remaining_milk_month"] = metrics["milk_month"] - metrics["milk_distributed_month"]
+    return {k: float(v) for k, v in metrics.items()}
+
+
+@st.cache_data(ttl=60, max_entries=2, show_spinner=False)
+def compute_production_metrics(month):
+    """production_metrics() reused across reruns; a failed sheet raises, so partial figures are never cached"""
+    return production_metrics(load_all_filtered(PAGE_SHEETS["Milking & Feeding"], raise_errors=True), month)
+
+
+def daily_production_delivery(bundle):
+    """Daily Produced / Delivered litres (Date index, sorted) from the production sheets"""
+    df_cow_log = bundle["cow_log"]
+    if not df_cow_log.empty and MILK_COLUMN in df_cow_log.columns:
+        daily_prod = daily_sum(df_cow_log["Date"], df_cow_log[MILK_COLUMN])
+    else:
+        daily_prod = pd.Series(dtype="float64", index=pd.DatetimeIndex([], name="Date"))
+    df_delivery = daily_distribution_totals(bundle["milk_m"], bundle["milk_e"])
+
+    if daily_prod.empty or df_delivery.empty:
+        return pd.DataFrame(columns=["Produced", "Delivered"], index=pd.DatetimeIndex([], name="Date"), dtype="float64")
+    # Both series are already one value per Date: align on the index instead of merging columns
+    chart_df = pd.concat({"Produced": daily_prod, "Delivered": df_delivery}, axis=1).fillna(0)
+    # Litres are float32 since load: round so tooltips show 12.3, not 12.300000190734863
+    return chart_df.sort_index().round(2)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def production_delivery_trend():
+    """daily_production_delivery() built once per TTL; the dashboard chart only slices it"""
+    return daily_production_delivery(load_all_filtered(PAGE_SHEETS["Milking & Feeding"], raise_errors=True))
+
+
+def cached_or_partial(cached_fn, fn, keys, *args):
+    """cached_fn(*args); if a sheet failed, report it on the page and compute fn from what loaded (not cached)"""
+    try:
+        return cached_fn(*args)
+    except Exception:
+        return fn(load_all_filtered(keys), *args)
+
+# Kick off every sheet download once per cache period, so the network overlaps the sidebar
+# and page render and the other pages' sheets are warm by the time they are opened
+prefetch_all_sheets()
 
 # ============================================================
 # SIDEBAR NAVIGATION
@@ -72,6 +518,10 @@ page = st.sidebar.radio(
     ],
 )
 
+# Taken once per rerun so every page agrees on "today" and "this month"
+NOW = pd.Timestamp.now()
+CURRENT_MONTH = str(NOW.to_period("M"))
+
 # ============================================================
 # 🏠 DASHBOARD PAGE
 # ============================================================
@@ -126,64 +576,30 @@ if page == "🏠 Dashboard":
     st.header("🐄 Dairy Farm Dashboard")
 
     # -------------------- Load Data --------------------
-    START_DATE = pd.Timestamp("2025-11-01")
-    df_cow_log = load_csv(COW_LOG_CSV_URL, drop_cols=["Timestamp"])
-    df_expense = load_csv(EXPENSE_CSV_URL, drop_cols=["Timestamp"])
-    df_milk_m = load_csv(MILK_DIS_M_CSV_URL, drop_cols=["Timestamp"])
-    df_milk_e = load_csv(MILK_DIS_E_CSV_URL, drop_cols=["Timestamp"])
-    df_payment_received = load_csv(PAYMENT_CSV_URL, drop_cols=["Timestamp"])
-    df_investment = load_csv(INVESTMENT_CSV_URL, drop_cols=["Timestamp"])
-
-    # -------------------- Filter from 1 Nov 2025 --------------------
-    for df in [df_cow_log, df_expense, df_milk_m, df_milk_e, df_payment_received, df_investment]:
-        if "Date" in df.columns:
-            df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-            df.dropna(subset=["Date"], inplace=True)
-            df = df[df["Date"] >= START_DATE]
+    # Production sheets only (already trimmed to START_DATE at load); the ledger
+    # totals come from compute_dashboard_kpis, which reads every sheet itself
+    bundle = load_all_filtered(PAGE_SHEETS[page])
+    df_cow_log = bundle["cow_log"]
+    df_milk_m = bundle["milk_m"]
+    df_milk_e = bundle["milk_e"]
 
     # -------------------- Lifetime Summary --------------------
     st.subheader("📊 Overall Summary")
 
-    milk_col = next((c for c in df_cow_log.columns if "milk" in c.lower() or "दूध" in c), None)
-    total_milk_produced = pd.to_numeric(df_cow_log[milk_col], errors="coerce").sum() if milk_col else 0
-
-    total_milk_m = sum_numeric_columns(df_milk_m, exclude_cols=["Timestamp", "Date"])
-    total_milk_e = sum_numeric_columns(df_milk_e, exclude_cols=["Timestamp", "Date"])
-    total_milk_distributed = total_milk_m + total_milk_e
-    remaining_milk = total_milk_produced - total_milk_distributed
-
-    total_expense = pd.to_numeric(df_expense["Amount"], errors="coerce").sum() if not df_expense.empty else 0
-    total_payment_received = pd.to_numeric(df_payment_received["Amount"], errors="coerce").sum() if not df_payment_received.empty else 0
-    total_investment = pd.to_numeric(df_investment["Amount"], errors="coerce").sum() if not df_investment.empty else 0
-
-    investment_bipin = (
-        df_investment.loc[df_investment["Paid To"] == "Bipin Kumar", "Amount"].sum()
-        if "Paid To" in df_investment.columns
-        else 0
-    )
-    received_bipin = (
-        df_payment_received.loc[df_payment_received["Received By"] == "Bipin Kumar", "Amount"].sum()
-        if "Received By" in df_payment_received.columns
-        else 0
-    )
-    expense_bipin = (
-        df_expense.loc[df_expense["Expense By"] == "Bipin Kumar", "Amount"].sum()
-        if "Expense By" in df_expense.columns
-        else 0
-    )
-    fund_bipin = investment_bipin + received_bipin - expense_bipin
+    kpis = cached_or_partial(compute_dashboard_kpis, dashboard_kpis, ALL_SHEETS, CURRENT_MONTH)
+    milk_col = MILK_COLUMN if MILK_COLUMN in df_cow_log.columns else None
 
     # -------------------- Metrics --------------------
     c1, c2, c3, c4 = st.columns(4)
-    c1.metric("🥛 Total Milk Produced", f"{total_milk_produced:.2f} L")
-    c2.metric("🚚 Total Milk Distributed", f"{total_milk_distributed:.2f} L")
-    c3.metric("❗ Remaining / Lost Milk", f"{remaining_milk:.2f} L")
-    c4.metric("💸 Total Expense", f"₹{total_expense:,.2f}")
+    c1.metric("🥛 Total Milk Produced", f"{kpis['total_milk_produced']:.2f} L")
+    c2.metric("🚚 Total Milk Distributed", f"{kpis['total_milk_distributed']:.2f} L")
+    c3.metric("❗ Remaining / Lost Milk", f"{kpis['remaining_milk']:.2f} L")
+    c4.metric("💸 Total Expense", f"₹{kpis['total_expense']:,.2f}")
 
     c5, c6, c7 = st.columns(3)
-    c5.metric("💰 Total Payment Received", f"₹{total_payment_received:,.2f}")
-    c6.metric("📈 Total Investment", f"₹{total_investment:,.2f}")
-    c7.metric("🏦 Fund (Bipin Kumar)", f"₹{fund_bipin:,.2f}")
+    c5.metric("💰 Total Payment Received", f"₹{kpis['total_payment_received']:,.2f}")
+    c6.metric("📈 Total Investment", f"₹{kpis['total_investment']:,.2f}")
+    c7.metric("🏦 Fund (Bipin Kumar)", f"₹{kpis['fund_bipin']:,.2f}")
 
     st.markdown("<hr/>", unsafe_allow_html=True)
 
@@ -191,12 +607,12 @@ if page == "🏠 Dashboard":
     st.subheader("🕒 Latest Summary")
     
     # --- Find last 2 milk produced records ---
-    df_sorted_prod = df_cow_log.sort_values("Date", ascending=False).head(2)
+    df_sorted_prod = df_cow_log.nlargest(2, "Date")
     
     def get_shift_total(row):
         shift = row["Shift - पहर"] if "Shift - पहर" in row else row.get("Shift", "")
-        milk_value = row[milk_col] if milk_col in row else 0
-        milk_value = pd.to_numeric(milk_value, errors="coerce")
+        # float32 since load: round so 2.7 shows as 2.7, not 2.700000047683716
+        milk_value = round(float(row[milk_col]), 2) if milk_col in row else 0
         return shift, milk_value
     
     latest_prod_1 = df_sorted_prod.iloc[0]
@@ -214,17 +630,12 @@ if page == "🏠 Dashboard":
         if target_df.empty:
             return None, shift, 0
     
-        df_sorted = target_df.sort_values("Date", ascending=False)
-    
-        row = df_sorted.iloc[0]
+        latest = target_df.loc[[target_df["Date"].idxmax()]]
     
-        # Convert all columns except "Date" to numeric and sum
-        total = pd.to_numeric(
-            row.drop(labels=["Date"], errors="ignore"),
-            errors="coerce"
-        ).sum()
+        # Customer columns are float32 since load: sum the row directly, rounded for display
+        total = round(float(row_totals(latest)[0]), 2)
     
-        date = row["Date"].strftime("%d-%m-%Y")
+        date = latest["Date"].iloc[0].strftime("%d-%m-%Y")
     
         return date, shift, total
 
@@ -259,99 +670,63 @@ if page == "🏠 Dashboard":
     
 
     # -------------------- Current Month Summary --------------------
-    today = pd.Timestamp.today()
-    current_month_name = today.strftime("%B %Y")
+    current_month_name = NOW.strftime("%B %Y")
     st.subheader(f"📅 Current Month Summary ({current_month_name})")
 
-    def filter_month(df):
-        if df.empty or "Date" not in df.columns:
-            return df
-        return df[df["Date"].dt.month == today.month]
-
-    df_month_expense = filter_month(df_expense)
-    df_month_milk_m = filter_month(df_milk_m)
-    df_month_milk_e = filter_month(df_milk_e)
-    df_month_cow_log = filter_month(df_cow_log)
-    df_month_payment = filter_month(df_payment_received)
-
-    milk_col = next((c for c in df_month_cow_log.columns if "milk" in c.lower() or "दूध" in c), None)
-    milk_month = pd.to_numeric(df_month_cow_log[milk_col], errors="coerce").sum() if milk_col else 0
-    milk_m_month = sum_numeric_columns(df_month_milk_m, exclude_cols=["Timestamp", "Date"])
-    milk_e_month = sum_numeric_columns(df_month_milk_e, exclude_cols=["Timestamp", "Date"])
-    milk_distributed_month = milk_m_month + milk_e_month
-    remaining_milk_month = milk_month - milk_distributed_month
-
-    expense_month = pd.to_numeric(df_month_expense["Amount"], errors="coerce").sum() if not df_month_expense.empty else 0
-    payment_month = pd.to_numeric(df_month_payment["Amount"], errors="coerce").sum() if not df_month_payment.empty else 0
-
     cm1, cm2, cm3, cm4, cm5 = st.columns(5)
-    cm1.metric("🥛 Milk Produced (This Month)", f"{milk_month:.2f} L")
-    cm2.metric("🚚 Milk Distributed (This Month)", f"{milk_distributed_month:.2f} L")
-    cm3.metric("❗ Remaining Milk (This Month)", f"{remaining_milk_month:.2f} L")
-    cm4.metric("💸 Expense (This Month)", f"₹{expense_month:,.2f}")
-    cm5.metric("💰 Payment Received (This Month)", f"₹{payment_month:,.2f}")
+    cm1.metric("🥛 Milk Produced (This Month)", f"{kpis['milk_month']:.2f} L")
+    cm2.metric("🚚 Milk Distributed (This Month)", f"{kpis['milk_distributed_month']:.2f} L")
+    cm3.metric("❗ Remaining Milk (This Month)", f"{kpis['remaining_milk_month']:.2f} L")
+    cm4.metric("💸 Expense (This Month)", f"₹{kpis['expense_month']:,.2f}")
+    cm5.metric("💰 Payment Received (This Month)", f"₹{kpis['payment_month']:,.2f}")
 
     st.markdown("<hr/>", unsafe_allow_html=True)
 
     # -------------------- Milk Production vs Delivery Graph --------------------
-    # -------------------- Milk Production vs Delivery Graph --------------------
-    st.subheader("📈 Milk Production vs Delivery Trend")
+    # A fragment: changing the range radio reruns only this chart, not the whole dashboard
+    @st.fragment
+    def production_vs_delivery_chart():
+        st.subheader("📈 Milk Production vs Delivery Trend")
     
-    # --- Centered Radio Button for Date Range
-    col1, col2, col3 = st.columns([1, 3, 1])  # Center alignment
-    with col2:
-        range_option = st.radio(
-            "",
-            ["1 Week", "1 Month", "3 Months", "6 Months", "1 Year", "3 Years", "5 Years", "Max"],
-            horizontal=True,
-            index=1,  # Default to "3 Months"
-        )
-    
-    # --- Determine date range based on selection
-    today = pd.Timestamp.today()
-    date_limit = {
-        "1 Week": today - pd.Timedelta(weeks=1),
-        "1 Month": today - pd.DateOffset(months=1),
-        "3 Months": today - pd.DateOffset(months=3),
-        "6 Months": today - pd.DateOffset(months=6),
-        "1 Year": today - pd.DateOffset(years=1),
-        "3 Years": today - pd.DateOffset(years=3),
-        "5 Years": today - pd.DateOffset(years=5),
-        "Max": START_DATE,
-    }[range_option]
-    
-    # --- Prepare production data
-    if not df_cow_log.empty and milk_col:
-        df_cow_log["Date"] = pd.to_datetime(df_cow_log["Date"], errors="coerce")
-        df_cow_log = df_cow_log[df_cow_log["Date"] >= date_limit]
-        daily_prod = df_cow_log.groupby("Date")[milk_col].sum().reset_index()
-    else:
-        daily_prod = pd.DataFrame(columns=["Date", "Produced"])
+        # --- Centered Radio Button for Date Range
+        col1, col2, col3 = st.columns([1, 3, 1])  # Center alignment
+        with col2:
+            range_option = st.radio(
+                "",
+                ["1 Week", "1 Month", "3 Months", "6 Months", "1 Year", "3 Years", "5 Years", "Max"],
+                horizontal=True,
+                index=1,  # Default to "3 Months"
+            )
     
-    # --- Combine morning & evening distribution
-    def combine_distribution(df1, df2):
-        df_all = pd.concat([df1, df2])
-        df_all["Date"] = pd.to_datetime(df_all["Date"], errors="coerce")
-        df_all["Total"] = df_all.select_dtypes(include="number").sum(axis=1)
-        return df_all.groupby("Date")["Total"].sum().reset_index()
+        # --- Determine date range based on selection
+        date_limit = {
+            "1 Week": NOW - pd.Timedelta(weeks=1),
+            "1 Month": NOW - pd.DateOffset(months=1),
+            "3 Months": NOW - pd.DateOffset(months=3),
+            "6 Months": NOW - pd.DateOffset(months=6),
+            "1 Year": NOW - pd.DateOffset(years=1),
+            "3 Years": NOW - pd.DateOffset(years=3),
+            "5 Years": NOW - pd.DateOffset(years=5),
+            "Max": START_DATE,
+        }[range_option]
     
-    df_delivery = combine_distribution(df_milk_m, df_milk_e)
-    df_delivery = df_delivery[df_delivery["Date"] >= date_limit]
+        # --- Slice the precomputed daily series (built once per cache TTL, not per click)
+        trend = cached_or_partial(production_delivery_trend, daily_production_delivery, PAGE_SHEETS["Milking & Feeding"])
+        window = trend.iloc[trend.index.searchsorted(date_limit):]
     
-    # --- Display line chart
-    if not daily_prod.empty and not df_delivery.empty:
-        chart_df = pd.merge(daily_prod, df_delivery, on="Date", how="outer").fillna(0)
-        chart_df = chart_df.rename(columns={milk_col: "Produced", "Total": "Delivered"})
-        st.line_chart(chart_df.set_index("Date"))
-    else:
-        st.info("No sufficient data for chart.")
+        # --- Display line chart
+        if not window.empty:
+            st.line_chart(window)
+        else:
+            st.info("No sufficient data for chart.")
+
+    production_vs_delivery_chart()
 
     # -------------------- Missing Entries CARDS (final colors + layout) --------------------
     
     st.markdown("### 📌 Pending Entries")
     
-    VALIDATION_START = pd.Timestamp("2025-11-01")
-    today_norm = pd.Timestamp.today().normalize()
+    today_norm = NOW.normalize()
     
     # Compact sizing
     CARD_WIDTH = "220px"
@@ -399,17 +774,10 @@ if page == "🏠 Dashboard":
     if VALIDATION_START > today_norm:
         st.info(f"Validation will start from {VALIDATION_START.strftime('%Y-%m-%d')}.")
     else:
-        # Use copies of dataframes
-        cow_log = df_cow_log.copy() if df_cow_log is not None else pd.DataFrame()
-        milk_m = df_milk_m.copy() if df_milk_m is not None else pd.DataFrame()
-        milk_e = df_milk_e.copy() if df_milk_e is not None else pd.DataFrame()
-    
-        # Normalize "Date" columns (day-first tolerant)
-        for dfr in [cow_log, milk_m, milk_e]:
-            if dfr is None or dfr.empty:
-                continue
-            if "Date" in dfr.columns:
-                dfr["Date"] = pd.to_datetime(dfr["Date"], dayfirst=True, errors="coerce")
+        # "Date" is already datetime64 (parsed once in get_sheet), so read-only use is safe
+        cow_log = df_cow_log if df_cow_log is not None else pd.DataFrame()
+        milk_m = df_milk_m if df_milk_m is not None else pd.DataFrame()
+        milk_e = df_milk_e if df_milk_e is not None else pd.DataFrame()
     
         # Detect shift & cowid columns
         shift_col = None
@@ -422,48 +790,41 @@ if page == "🏠 Dashboard":
                     cowid_col = c
             if cowid_col is None:
                 for c in cow_log.columns:
-                    if c.strip().lower() in ["cowid", "cow id", "cow_id"]:
+                    if c.lower() in ["cowid", "cow id", "cow_id"]:  # headers stripped at load
                         cowid_col = c
                         break
     
-        # Helper functions
-        def has_shift_on_date_for_cow(df, date, shift_col, cowid_col, cowid_value, shift_name):
-            if df is None or df.empty or shift_col is None or cowid_col is None:
-                return False
-            mask = (df["Date"].dt.normalize() == date.normalize()) & (df[cowid_col].astype(str).str.strip() == str(cowid_value).strip())
-            if not mask.any():
-                return False
-            vals = df.loc[mask, shift_col].dropna().astype(str).str.lower().str.strip().tolist()
-            if not vals:
-                return False
-            joined = " ".join(vals)
-            if shift_name.lower() == "morning":
-                return any(k in joined for k in ["morning", "mor", "सुबह", "भोर", "am"])
-            else:
-                return any(k in joined for k in ["evening", "eve", "शाम", "pm", "even"])
+        # Normalize the cow log once: the (CowID, day) pairs that have a morning / evening entry
+        morning_entries, evening_entries = set(), set()
+        if shift_col and cowid_col and not cow_log.empty:
+            logged = cow_log[shift_col].notna()
+            cows = cow_log.loc[logged, cowid_col].astype(str).str.strip()
+            days = cow_log.loc[logged, "Date"].dt.normalize()
+            shifts = cow_log.loc[logged, shift_col].astype(str).str.lower().str.strip()
+            is_morning = shifts.str.contains("|".join(["morning", "mor", "सुबह", "भोर", "am"]))
+            is_evening = shifts.str.contains("|".join(["evening", "eve", "शाम", "pm", "even"]))
+            morning_entries = set(zip(cows[is_morning], days[is_morning]))
+            evening_entries = set(zip(cows[is_evening], days[is_evening]))
     
-        def has_any_on_date(df, date):
-            if df is None or df.empty or "Date" not in df.columns:
-                return False
-            return not df[df["Date"].dt.normalize() == date.normalize()].empty
+        # Helper functions
+        def has_shift_on_date_for_cow(cowid_value, date, shift_name):
+            entries = morning_entries if shift_name.lower() == "morning" else evening_entries
+            return (str(cowid_value).strip(), date.normalize()) in entries
     
         missing_cards = []
     
         # Per-CowID Milking & Feeding validation (both shifts use same milking gradient)
         if cowid_col and not cow_log.empty:
-            cow_ids = cow_log[cowid_col].dropna().astype(str).str.strip().unique().tolist()
-            for cowid in cow_ids:
-                cow_rows = cow_log[cow_log[cowid_col].astype(str).str.strip() == str(cowid).strip()]
-                if cow_rows.empty or "Date" not in cow_rows.columns:
-                    continue
-                first_date = cow_rows["Date"].min()
-                cow_start = max(VALIDATION_START, pd.to_datetime(first_date).normalize())
+            cow_keys = cow_log[cowid_col].dropna().astype(str).str.strip()
+            first_dates = cow_log.loc[cow_keys.index, "Date"].groupby(cow_keys, sort=False).min()
+            for cowid, first_date in first_dates.items():
+                cow_start = max(VALIDATION_START, first_date.normalize())
                 if cow_start > today_norm:
                     continue
                 for d in pd.date_range(start=cow_start, end=today_norm, freq="D"):
                     date_str = d.strftime("%Y-%m-%d")
                     # missing morning
-                    if not has_shift_on_date_for_cow(cow_log, d, shift_col, cowid_col, cowid, "Morning"):
+                    if not has_shift_on_date_for_cow(cowid, d, "Morning"):
                         url = cow_form_template.format(
                             DATE=urllib.parse.quote(date_str, safe=""),
                             SHIFT=urllib.parse.quote("Morning", safe=""),
@@ -478,7 +839,7 @@ if page == "🏠 Dashboard":
                             "gradient": gradients["milking"]
                         })
                     # missing evening
-                    if not has_shift_on_date_for_cow(cow_log, d, shift_col, cowid_col, cowid, "Evening"):
+                    if not has_shift_on_date_for_cow(cowid, d, "Evening"):
                         url = cow_form_template.format(
                             DATE=urllib.parse.quote(date_str, safe=""),
                             SHIFT=urllib.parse.quote("Evening", safe=""),
@@ -496,17 +857,27 @@ if page == "🏠 Dashboard":
             # fallback: date-based check without cowid
             for d in pd.date_range(start=VALIDATION_START, end=today_norm, freq="D"):
                 date_str = d.strftime("%Y-%m-%d")
-                if not has_shift_on_date_for_cow(cow_log, d, shift_col, cowid_col, "", "Morning"):
+                if not has_shift_on_date_for_cow("", d, "Morning"):
                     url = cow_form_template.format(DATE=urllib.parse.quote(date_str, safe=""), SHIFT=urllib.parse.quote("Morning", safe=""), COWID=urllib.parse.quote("", safe=""))
                     missing_cards.append({"kind":"milking","cowid":"","date":date_str,"shift":"Morning","url":url,"gradient":gradients["milking"]})
-                if not has_shift_on_date_for_cow(cow_log, d, shift_col, cowid_col, "", "Evening"):
+                if not has_shift_on_date_for_cow("", d, "Evening"):
                     url = cow_form_template.format(DATE=urllib.parse.quote(date_str, safe=""), SHIFT=urllib.parse.quote("Evening", safe=""), COWID=urllib.parse.quote("", safe=""))
                     missing_cards.append({"kind":"milking","cowid":"","date":date_str,"shift":"Evening","url":url,"gradient":gradients["milking"]})
     
         # Global Milk Distribution validation (one per date)
-        for d in pd.date_range(start=VALIDATION_START, end=today_norm, freq="D"):
+        validation_days = pd.date_range(start=VALIDATION_START, end=today_norm, freq="D")
+    
+        def days_with_entries(df):
+            # One vectorized membership test over all days instead of a frame scan per day
+            if df.empty or "Date" not in df.columns:
+                return np.zeros(len(validation_days), dtype=bool)
+            return validation_days.isin(df["Date"].dt.normalize())
+    
+        for d, has_morning, has_evening in zip(
+            validation_days, days_with_entries(milk_m), days_with_entries(milk_e)
+        ):
             date_str = d.strftime("%Y-%m-%d")
-            if not has_any_on_date(milk_m, d):
+            if not has_morning:
                 url = morning_milk_form.format(DATE=urllib.parse.quote(date_str, safe=""))
                 missing_cards.append({
                     "kind": "distribution",
@@ -515,7 +886,7 @@ if page == "🏠 Dashboard":
                     "url": url,
                     "gradient": gradients["dist_morning"]
                 })
-            if not has_any_on_date(milk_e, d):
+            if not has_evening:
                 url = evening_milk_form.format(DATE=urllib.parse.quote(date_str, safe=""))
                 missing_cards.append({
                     "kind": "distribution",
@@ -629,83 +1000,33 @@ elif page == "Milking & Feeding":
     
         # ─────────────────────────────────────────────────────
 
-    # --- Load data ---
-    df = load_csv(COW_LOG_CSV_URL, drop_cols=["Timestamp"])
-    df_morning = load_csv(MILK_DIS_M_CSV_URL, drop_cols=["Timestamp"])
-    df_evening = load_csv(MILK_DIS_E_CSV_URL, drop_cols=["Timestamp"])
-
-    # --- Date setup ---
-    start_date = pd.Timestamp("2025-11-01")
-    now = pd.Timestamp.now()
-    this_month = now.month
-    this_year = now.year
-
-    # --- Clean and filter helper ---
-    def clean_and_filter(df):
-        if df.empty or "Date" not in df.columns:
-            return df
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        df = df[df["Date"] >= start_date]
-        df["Date"] = df["Date"].dt.strftime("%d-%m-%Y")
-        return df
+    # --- Load data (already filtered from 1 Nov 2025) ---
+    bundle = load_all_filtered(PAGE_SHEETS[page])
+    df = bundle["cow_log"]
 
-    df = clean_and_filter(df)
-    df_morning = clean_and_filter(df_morning)
-    df_evening = clean_and_filter(df_evening)
-
-    # --- Detect milk column dynamically ---
-    milk_col = None
-    for c in df.columns:
-        if "milk" in c.lower() or "दूध" in c:
-            milk_col = c
-            break
-
-    # --- Ensure numeric ---
-    if not df.empty and milk_col:
-        df[milk_col] = pd.to_numeric(df[milk_col], errors="coerce")
+    # --- Milk column (renamed to MILK_COLUMN at load) ---
+    milk_col = MILK_COLUMN if MILK_COLUMN in df.columns else None
 
-    # --- Total milk produced ---
-    total_milk_produced = df[milk_col].sum() if not df.empty and milk_col else 0
-
-    # --- Total milk this month ---
-    total_milk_month = 0
-    if not df.empty and milk_col:
-        df["Date_dt"] = pd.to_datetime(df["Date"], format="%d-%m-%Y", errors="coerce")
-        df_this_month = df[
-            (df["Date_dt"].dt.month == this_month) & (df["Date_dt"].dt.year == this_year)
-        ]
-        if not df_this_month.empty:
-            total_milk_month = df_this_month[milk_col].sum()
+    # --- Produced / delivered totals (cached per month) ---
+    metrics = cached_or_partial(compute_production_metrics, production_metrics, PAGE_SHEETS["Milking & Feeding"], CURRENT_MONTH)
 
     # --- Cow-wise total ---
     cow_wise = pd.DataFrame()
     if not df.empty and "CowID" in df.columns and milk_col:
         cow_wise = (
-            df.groupby("CowID")[milk_col]
-            .sum()
-            .reset_index()
-            .rename(columns={milk_col: "Total Milk (L)"})
+            sum_by_category(df["CowID"], df[milk_col])  # CowID is a category since load
+            .rename_axis("CowID")
+            .round(2)  # float32 inputs summed in float64: hide the 2.2999999 noise
+            .reset_index(name="Total Milk (L)")
             .sort_values("Total Milk (L)", ascending=False)
         )
 
-    # --- Total Milk Distributed ---
-    def total_milk_distributed(df):
-        if df.empty:
-            return 0
-        numeric_cols = [c for c in df.columns if c not in ["Timestamp", "Date"]]
-        df_numeric = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-        return df_numeric.sum().sum()
-
-    total_distributed_morning = total_milk_distributed(df_morning)
-    total_distributed_evening = total_milk_distributed(df_evening)
-    total_distributed = total_distributed_morning + total_distributed_evening
-
     # --- KPIs ---
     st.subheader("📊 Key Metrics (From 1 Nov 2025)")
     col1, col2, col3 = st.columns(3)
-    col1.metric("🥛 Total Milk Produced", f"{total_milk_produced:.2f} L")
-    col2.metric("📅 Milk Produced This Month", f"{total_milk_month:.2f} L")
-    col3.metric("🚚 Total Milk Delivered", f"{total_distributed:.2f} L")
+    col1.metric("🥛 Total Milk Produced", f"{metrics['total_milk_produced']:.2f} L")
+    col2.metric("📅 Milk Produced This Month", f"{metrics['milk_month']:.2f} L")
+    col3.metric("🚚 Total Milk Delivered", f"{metrics['total_milk_distributed']:.2f} L")
 
     # --- Cow-wise production ---
     st.divider()
@@ -719,12 +1040,8 @@ elif page == "Milking & Feeding":
     st.divider()
     st.subheader("📅 Daily Milk Production Trend")
     if not df.empty and milk_col:
-        df_daily = df.copy()
-        df_daily["Date_dt"] = pd.to_datetime(df_daily["Date"], format="%d-%m-%Y", errors="coerce")
-        daily_summary = (
-            df_daily.groupby("Date_dt")[milk_col].sum().reset_index().sort_values("Date_dt")
-        )
-        st.line_chart(daily_summary.set_index("Date_dt"))
+        # Sorted by day, missing days shown as 0
+        st.line_chart(daily_sum(df["Date"], df[milk_col]).rename(milk_col).round(2))
     else:
         st.info("No daily milking data to display.")
 
@@ -732,8 +1049,8 @@ elif page == "Milking & Feeding":
     st.divider()
     st.subheader("📋 Raw Milking & Feeding Data (From 1 Nov 2025)")
     if not df.empty:
-        df_display = df.sort_values(by="Date", ascending=False)
-        st.dataframe(df_display, use_container_width=True)
+        df_display = for_display(latest_first(df))
+        st.dataframe(df_display, use_container_width=True, column_config=DISPLAY_COLUMN_CONFIG)
     else:
         st.info("No milking & feeding data available after 1 Nov 2025.")
 
@@ -744,77 +1061,19 @@ elif page == "Milking & Feeding":
 elif page == "Milk Distribution":
     st.title("🥛 Milk Distribution")
 
-    # --- Load data ---
-    df_morning = load_csv(MILK_DIS_M_CSV_URL, drop_cols=["Timestamp"])
-    df_evening = load_csv(MILK_DIS_E_CSV_URL, drop_cols=["Timestamp"])
-    df_cow_log = load_csv(COW_LOG_CSV_URL, drop_cols=["Timestamp"])
+    # --- Load data (already filtered from 1 Nov 2025) ---
+    bundle = load_all_filtered(PAGE_SHEETS[page])
+    df_morning = bundle["milk_m"]
+    df_evening = bundle["milk_e"]
 
-    # --- Date filtering: only include records from 1 Nov 2025 onward ---
-    start_date = pd.Timestamp("2025-11-01")
-
-    def clean_and_filter(df):
-        if df.empty or "Date" not in df.columns:
-            return df
-        df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
-        df = df[df["Date"] >= start_date]  # Filter only from 1 Nov 2025
-        df["Date"] = df["Date"].dt.strftime("%d-%m-%Y")  # Format date
-        return df
-
-    df_morning = clean_and_filter(df_morning)
-    df_evening = clean_and_filter(df_evening)
-
-    # --- Total milk distributed (sum numeric columns except date) ---
-    def total_milk_distributed(df):
-        if df.empty:
-            return 0
-        numeric_cols = [c for c in df.columns if c not in ["Timestamp", "Date"]]
-        df_numeric = df[numeric_cols].apply(pd.to_numeric, errors="coerce")
-        return df_numeric.sum().sum()
-
-    total_morning = total_milk_distributed(df_morning)
-    total_evening = total_milk_distributed(df_evening)
-    total_distributed = total_morning + total_evening
-
-    # --- Monthly totals ---
-    this_month = pd.Timestamp.now().month
-    this_year = pd.Timestamp.now().year
-
-    def monthly_distribution(df):
-        if df.empty or "Date" not in df.columns:
-            return 0
-        df["Date"] = pd.to_datetime(df["Date"], format="%d-%m-%Y", errors="coerce")
-        df_this_month = df[
-            (df["Date"].dt.month == this_month) & (df["Date"].dt.year == this_year)
-        ]
-        return total_milk_distributed(df_this_month)
-
-    monthly_morning = monthly_distribution(df_morning)
-    monthly_evening = monthly_distribution(df_evening)
-    monthly_distributed = monthly_morning + monthly_evening
-
-    # --- Total milk produced this month from cow log (filter from 1 Nov 2025) ---
-    total_milk_produced_month = 0
-    if not df_cow_log.empty:
-        df_cow_log.columns = [c.strip().lower() for c in df_cow_log.columns]
-        if "date" in df_cow_log.columns and "milking -दूध" in df_cow_log.columns:
-            df_cow_log["date"] = pd.to_datetime(df_cow_log["date"], errors="coerce")
-            df_cow_log = df_cow_log[df_cow_log["date"] >= start_date]  # Filter Nov 1 onward
-            df_cow_log["month"] = df_cow_log["date"].dt.month
-            df_cow_log["year"] = df_cow_log["date"].dt.year
-            df_month = df_cow_log[
-                (df_cow_log["month"] == this_month) & (df_cow_log["year"] == this_year)
-            ]
-            total_milk_produced_month = pd.to_numeric(
-                df_month["milking -दूध"], errors="coerce"
-            ).sum()
-
-    remaining_milk = total_milk_produced_month - monthly_distributed
+    # --- Distributed / produced totals (cached per month, shared with Milking & Feeding) ---
+    metrics = cached_or_partial(compute_production_metrics, production_metrics, PAGE_SHEETS["Milking & Feeding"], CURRENT_MONTH)
 
     # --- KPI Metrics ---
     col1, col2, col3 = st.columns(3)
-    col1.metric("🥛 Total Milk Distributed (from 1 Nov 2025)", f"{total_distributed:.2f} L")
-    col2.metric("📅 This Month's Distribution", f"{monthly_distributed:.2f} L")
-    col3.metric("🧾 Remaining Milk (This Month)", f"{remaining_milk:.2f} L")
+    col1.metric("🥛 Total Milk Distributed (from 1 Nov 2025)", f"{metrics['total_milk_distributed']:.2f} L")
+    col2.metric("📅 This Month's Distribution", f"{metrics['milk_distributed_month']:.2f} L")
+    col3.metric("🧾 Remaining Milk (This Month)", f"{metrics['remaining_milk_month']:.2f} L")
 
     st.divider()
 
@@ -833,8 +1092,8 @@ elif page == "Milk Distribution":
     
         # ─────────────────────────────────────────────────────
     if not df_morning.empty:
-        df_morning_display = df_morning.sort_values("Date", ascending=False)
-        st.dataframe(df_morning_display, use_container_width=True)
+        df_morning_display = for_display(latest_first(df_morning))
+        st.dataframe(df_morning_display, use_container_width=True, column_config=DISPLAY_COLUMN_CONFIG)
     else:
         st.info("No morning distribution data available after 1 Nov 2025.")
 
@@ -855,8 +1114,8 @@ elif page == "Milk Distribution":
         # ─────────────────────────────────────────────────────
 
     if not df_evening.empty:
-        df_evening_display = df_evening.sort_values("Date", ascending=False)
-        st.dataframe(df_evening_display, use_container_width=True)
+        df_evening_display = for_display(latest_first(df_evening))
+        st.dataframe(df_evening_display, use_container_width=True, column_config=DISPLAY_COLUMN_CONFIG)
     else:
         st.info("No evening distribution data available after 1 Nov 2025.")
 
@@ -865,20 +1124,9 @@ elif page == "Milk Distribution":
     st.subheader("📈 Daily Milk Distribution Trend (from 1 Nov 2025)")
 
     if not df_morning.empty or not df_evening.empty:
-        df_morning_chart = df_morning.copy()
-        df_evening_chart = df_evening.copy()
+        df_chart = daily_distribution_totals(df_morning, df_evening)
 
-        for df_temp in [df_morning_chart, df_evening_chart]:
-            df_temp["Date"] = pd.to_datetime(df_temp["Date"], format="%d-%m-%Y", errors="coerce")
-            df_temp["Total"] = df_temp.select_dtypes(include=["number"]).sum(axis=1)
-
-        df_chart = pd.concat([
-            df_morning_chart[["Date", "Total"]],
-            df_evening_chart[["Date", "Total"]],
-        ])
-        df_chart = df_chart.groupby("Date")["Total"].sum().reset_index().sort_values("Date")
-
-        st.line_chart(df_chart.set_index("Date"))
+        st.line_chart(df_chart.round(2))
     else:
         st.info("No distribution data available to plot.")
 
@@ -901,24 +1149,18 @@ elif page == "Expense":
     
         # ─────────────────────────────────────────────────────
 
-    df_expense = load_csv(EXPENSE_CSV_URL, drop_cols=["Timestamp"])
+    df_expense = load_all_filtered(PAGE_SHEETS[page])["expense"]
 
     if not df_expense.empty:
-        # --- Convert Date column properly ---
+        # --- Latest first (Date already parsed at load) ---
         if "Date" in df_expense.columns:
-            df_expense["Date"] = pd.to_datetime(df_expense["Date"], errors="coerce")
-            df_expense = df_expense.sort_values("Date", ascending=False)
+            df_expense = latest_first(df_expense)
 
         # --- Total Expense ---
         total_expense = df_expense["Amount"].sum()
 
         # --- Current Month Expense ---
-        current_month = pd.Timestamp.now().month
-        current_year = pd.Timestamp.now().year
-        df_this_month = df_expense[
-            (df_expense["Date"].dt.month == current_month)
-            & (df_expense["Date"].dt.year == current_year)
-        ]
+        df_this_month = df_expense[month_periods(df_expense) == NOW.to_period("M")]
         monthly_expense = df_this_month["Amount"].sum()
 
         # --- KPIs ---
@@ -931,7 +1173,7 @@ elif page == "Expense":
         # --- Expense by Type ---
         if "Expense Type" in df_expense.columns:
             expense_by_type = (
-                df_expense.groupby("Expense Type")["Amount"].sum().sort_values(ascending=False)
+                df_expense.groupby("Expense Type", observed=True)["Amount"].sum().sort_values(ascending=False)
             )
             st.subheader("📊 Expense by Type")
             st.bar_chart(expense_by_type)
@@ -939,14 +1181,14 @@ elif page == "Expense":
         # --- Expense by Person ---
         if "Expense By" in df_expense.columns:
             expense_by_person = (
-                df_expense.groupby("Expense By")["Amount"].sum().sort_values(ascending=False)
+                df_expense.groupby("Expense By", observed=True)["Amount"].sum().sort_values(ascending=False)
             )
             st.subheader("👤 Expense by Person")
             st.bar_chart(expense_by_person)
 
         st.divider()
         st.subheader("🧾 Detailed Expense Records")
-        st.dataframe(df_expense, use_container_width=True)
+        st.dataframe(for_display(df_expense), use_container_width=True, column_config=DISPLAY_COLUMN_CONFIG)
 
     else:
         st.info("No expense records found.")
@@ -966,8 +1208,8 @@ elif page == "Payments":
     
         # ─────────────────────────────────────────────────────
     
-    df_payment = load_csv(PAYMENT_CSV_URL, drop_cols=["Timestamp"])
-    st.dataframe(df_payment, use_container_width=True if not df_payment.empty else False)
+    df_payment = for_display(load_all_filtered(PAGE_SHEETS[page])["payment"])
+    st.dataframe(df_payment, use_container_width=True if not df_payment.empty else False, column_config=DISPLAY_COLUMN_CONFIG)
 
 elif page == "Investments":
     st.title("📈 Investment Log")
@@ -982,8 +1224,8 @@ elif page == "Investments":
         )
     
         # ─────────────────────────────────────────────────────
-    df_invest = load_csv(INVESTMENT_CSV_URL, drop_cols=["Timestamp"])
-    st.dataframe(df_invest, use_container_width=True if not df_invest.empty else False)
+    df_invest = for_display(load_all_filtered(PAGE_SHEETS[page])["investment"])
+    st.dataframe(df_invest, use_container_width=True if not df_invest.empty else False, column_config=DISPLAY_COLUMN_CONFIG)
 
 # ----------------------------
 # MANAGE CUSTOMERS PAGE
@@ -1334,19 +1576,15 @@ elif page == "Milk Bitran":
     
     if not df_bitran.empty and "MilkDelivered" in df_bitran.columns:
     
-        df_bitran["MilkDelivered"] = (
-            pd.to_numeric(df_bitran["MilkDelivered"], errors="coerce")
-            .fillna(0)
-        )
-    
         summary = (
             df_bitran
+            .assign(MilkDelivered=pd.to_numeric(df_bitran["MilkDelivered"], errors="coerce").fillna(0))
             .groupby(["Date", "Shift"])["MilkDelivered"]
             .sum()
+            .round(2)
             .reset_index()
             .sort_values("Date", ascending=False)
         )
-        summary["MilkDelivered"] = summary["MilkDelivered"].round(2)
     
         st.subheader("📊 Daily Summary")
     
@@ -1389,5 +1627,15 @@ elif page == "Milk Bitran":
 # ----------------------------
 # REFRESH BUTTON
 # ----------------------------
+if st.session_state.pop("refreshed", False):
+    st.toast("🔁 Refreshed from Google Sheets")
+
 if st.sidebar.button("🔁 Refresh"):
+    # A plain rerun would just hit the caches; drop them so fresh sheet data is fetched
+    get_sheet.clear()
+    compute_dashboard_kpis.clear()
+    compute_production_metrics.clear()
+    production_delivery_trend.clear()
+    clear_disk_cache()
+    st.session_state["refreshed"] = True  # toast on the rerun, after the new data is shown
     st.rerun()